@@ -1,6 +1,5 @@
 import sys
 import networkx as nx
-from collections import defaultdict
 from networkx.utils import open_file
 from networkx.utils import py_random_state
 from ._types import OrderedGraph, OrderedDiGraph
@@ -36,8 +35,8 @@ def random_tree(n, seed=None, create_using=None):
     Notes
     -----
     The current implementation of this function generates a uniformly
-    random Prüfer sequence then converts that to a tree via the
-    :func:`~networkx.from_prufer_sequence` function. Since there is a
+    random Prüfer sequence then converts that to a tree in the same way as
+    the :func:`~networkx.from_prufer_sequence` function. Since there is a
     bijection between Prüfer sequences of length *n* - 2 and trees on
     *n* nodes, the tree is chosen uniformly at random from the set of
     all trees on *n* nodes.
@@ -81,8 +80,13 @@ def random_tree(n, seed=None, create_using=None):
     if n == 1:
         utree = nx.empty_graph(1)
     else:
-        sequence = [seed.choice(range(n)) for i in range(n - 2)]
-        utree = nx.from_prufer_sequence(sequence)
+        # Note: ``seed.choices`` would be faster, but it draws differently
+        # from ``seed.choice`` and would change the tree for a given seed.
+        choice = seed.choice
+        population = range(n)
+        sequence = [choice(population) for _ in range(n - 2)]
+        utree = nx.empty_graph(n)
+        utree.add_edges_from(_prufer_to_edges(sequence))
 
     if create_using is None:
         tree = utree
@@ -113,6 +117,59 @@ def random_tree(n, seed=None, create_using=None):
     return tree
 
 
+def _prufer_to_edges(sequence):
+    """
+    Decodes a Prüfer sequence into the edges of the tree it represents.
+
+    This is the linear time algorithm used by
+    :func:`~networkx.from_prufer_sequence` and produces the same edges in the
+    same order, but works on plain lists instead of building a graph. The
+    sequence is assumed to be valid.
+
+    Parameters
+    ----------
+    sequence : List[int]
+        A Prüfer sequence of length *n* - 2 with items in {0, …, *n* - 1}
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The *n* - 1 edges of the tree
+
+    Example
+    -------
+    >>> import networkx as nx
+    >>> sequence = [3, 3, 3, 4]
+    >>> print(_prufer_to_edges(sequence))
+    [(0, 3), (1, 3), (2, 3), (3, 4), (4, 5)]
+    >>> tree = nx.from_prufer_sequence(sequence)
+    >>> assert set(map(frozenset, tree.edges)) == set(
+    >>>     map(frozenset, _prufer_to_edges(sequence)))
+    """
+    n = len(sequence) + 2
+    degree = [1] * n
+    for v in sequence:
+        degree[v] += 1
+
+    edges = []
+    # The current leaf with the smallest label, and the lowest label that
+    # could still become the next leaf
+    index = u = degree.index(1)
+    for v in sequence:
+        edges.append((u, v))
+        degree[v] -= 1
+        if v < index and degree[v] == 1:
+            u = v
+        else:
+            index += 1
+            while degree[index] != 1:
+                index += 1
+            u = index
+    # The last remaining leaf is joined to the largest node
+    edges.append((u, n - 1))
+    return edges
+
+
 @py_random_state(2)
 def random_ordered_tree(n, seed=None, directed=False):
     """
@@ -303,138 +360,484 @@ def generate_network_text(
         # nodes that will reach the entire graph
         if sources is None:
             sources = _find_sources(graph)
+            # There is one source per (weakly) connected component, so this
+            # is a forest exactly when it has one less edge than nodes per
+            # component. In the directed case the sources are then the roots.
+            is_forest = graph.number_of_edges() == len(graph) - len(sources)
+        else:
+            is_forest = False
+
+        if max_depth is not None:
+            # Nodes past the maximum depth are never written, so only index
+            # the nodes that are reached and resolve their neighbors and
+            # labels on first use.
+            node_to_idx = _LazyIndex()
+            succ_list = _LazyAdjacency(succ, node_to_idx)
+            if is_directed:
+                pred_list = _LazyAdjacency(pred, node_to_idx)
+            else:
+                pred_list = succ_list
+            labels = _LazyLabels(node_to_idx.nodes, graph.nodes, label_attr)
+        else:
+            # Snapshot the graph into flat lists indexed by a contiguous
+            # integer id for each node, so the traversal below does not need
+            # to go through the networkx dict-of-dict views for every lookup.
+            nodes = list(graph.nodes)
+            node_to_idx = {node: idx for idx, node in enumerate(nodes)}
+            succ_list = [[node_to_idx[v] for v in succ[u]] for u in nodes]
+            if is_forest:
+                pred_list = None
+            elif is_directed:
+                pred_list = [[node_to_idx[v] for v in pred[u]] for u in nodes]
+            else:
+                pred_list = succ_list
+            if label_attr is not None:
+                labels = [
+                    str(data.get(label_attr, u))
+                    for u, data in graph.nodes(data=True)
+                ]
+            else:
+                labels = [str(u) for u in nodes]
+
+        # The glyphs written for a node (and prepended to its children) only
+        # depend on if it is a top level item and if it is the last sibling.
+        # Top level items (i.e. trees in the forest) get different glyphs to
+        # indicate they are not actually connected. Index this table with
+        # ``(bool(indents) << 1) | (not this_islast)``.
+        prefix_table = (
+            (glyphs.newtree_last, glyphs.endof_forest),
+            (glyphs.newtree_mid, glyphs.within_forest),
+            (glyphs.last, glyphs.endof_forest),
+            (glyphs.mid, glyphs.within_tree),
+        )
+
+        source_idxs = [node_to_idx[node] for node in sources]
+        if max_depth is None:
+            utils_cython = _cython_network_text_backend()
+        else:
+            # The compiled traversals require list snapshots, and a depth
+            # limited traversal only visits a small part of the graph anyway.
+            utils_cython = None
+        if is_forest:
+            # Traversing a forest from its roots is much simpler, so it gets
+            # its own implementation.
+            args = (
+                succ_list,
+                labels,
+                source_idxs,
+                max_depth,
+                prefix_table,
+                glyphs.backedge,
+                is_directed,
+            )
+            if utils_cython is not None:
+                yield from utils_cython._network_text_forest_lines_cython(*args)
+            else:
+                yield from _network_text_forest_lines(*args)
+        else:
+            args = (
+                succ_list,
+                pred_list,
+                labels,
+                source_idxs,
+                max_depth,
+                prefix_table,
+                glyphs.backedge,
+                is_directed,
+            )
+            if utils_cython is not None:
+                yield from utils_cython._network_text_lines_cython(*args)
+            else:
+                yield from _network_text_lines(*args)
+
+
+class _LazyIndex(dict):
+    """
+    Maps nodes to contiguous integer indexes, assigning the next index to each
+    node the first time it is requested.
+
+    Example
+    -------
+    >>> node_to_idx = _LazyIndex()
+    >>> print(node_to_idx["b"], node_to_idx["a"], node_to_idx["b"])
+    0 1 0
+    >>> print(node_to_idx.nodes)
+    ['b', 'a']
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = []
+
+    def __missing__(self, node):
+        idx = self[node] = len(self.nodes)
+        self.nodes.append(node)
+        return idx
+
+
+class _LazyAdjacency(dict):
+    """
+    Stands in for the list of the neighbor indexes of each node, looking up
+    the neighbors of a node the first time they are requested. Like that list,
+    its length is the number of nodes in the graph.
+
+    Example
+    -------
+    >>> import networkx as nx
+    >>> graph = nx.balanced_tree(2, 10, create_using=nx.DiGraph)
+    >>> node_to_idx = _LazyIndex()
+    >>> succ_list = _LazyAdjacency(graph.succ, node_to_idx)
+    >>> pred_list = _LazyAdjacency(graph.pred, node_to_idx)
+    >>> labels = _LazyLabels(node_to_idx.nodes, graph.nodes, None)
+    >>> prefix_table = ((" ", " "),) * 4
+    >>> lines = list(_network_text_lines(
+    >>>     succ_list, pred_list, labels, [node_to_idx[0]], 2, prefix_table,
+    >>>     "<-", True))
+    >>> print(chr(10).join(lines))
+     0
+      1
+       ...
+      2
+       ...
+    >>> # Only the written nodes and their neighbors are looked up
+    >>> print(len(succ_list), sorted(succ_list.keys()), len(node_to_idx))
+    2047 [0, 1, 2] 7
+    """
+
+    def __init__(self, adj, node_to_idx):
+        super().__init__()
+        self.adj = adj
+        self.node_to_idx = node_to_idx
+
+    def __len__(self):
+        return len(self.adj)
+
+    def __missing__(self, idx):
+        node_to_idx = self.node_to_idx
+        neighbors = [node_to_idx[v] for v in self.adj[node_to_idx.nodes[idx]]]
+        self[idx] = neighbors
+        return neighbors
+
+
+class _LazyLabels(dict):
+    """
+    Maps node indexes to the text written for them, resolving each label the
+    first time it is requested.
+
+    Example
+    -------
+    >>> import networkx as nx
+    >>> graph = nx.path_graph(3)
+    >>> graph.nodes[1]["label"] = "one"
+    >>> labels = _LazyLabels(list(graph.nodes), graph.nodes, "label")
+    >>> print(labels[1])
+    one
+    >>> print(labels)
+    {1: 'one'}
+    """
+
+    def __init__(self, nodes, node_data, label_attr):
+        super().__init__()
+        self.nodes = nodes
+        self.node_data = node_data
+        self.label_attr = label_attr
+
+    def __missing__(self, idx):
+        node = self.nodes[idx]
+        if self.label_attr is None:
+            label = str(node)
+        else:
+            label = str(self.node_data[node].get(self.label_attr, node))
+        self[idx] = label
+        return label
+
+
+def _network_text_lines(
+    succ_list,
+    pred_list,
+    labels,
+    sources,
+    max_depth,
+    prefix_table,
+    backedge,
+    is_directed,
+):
+    """
+    The depth first traversal behind :func:`generate_network_text`.
+
+    Operates on the integer indexed snapshot of the graph built by the caller.
+    See :func:`networkx_algo_common_subtree.utils_cython._network_text_lines_cython`
+    for the compiled version of this function.
+
+    Parameters
+    ----------
+    succ_list : List[List[int]] | Dict[int, List[int]]
+        The successors (or neighbors for undirected graphs) of each node
+
+    pred_list : List[List[int]] | Dict[int, List[int]]
+        The predecessors (or neighbors for undirected graphs) of each node
+
+    labels : List[str] | Dict[int, str]
+        The text to write for each node
+
+    sources : List[int]
+        The nodes to start traversal from
 
-        # Populate the stack with each:
-        # 1. parent node in the DFS tree (or None for root nodes),
-        # 2. the current node in the DFS tree
-        # 2. a list of indentations indicating depth
-        # 3. a flag indicating if the node is the final one to be written.
-        # Reverse the stack so sources are popped in the correct order.
-        last_idx = len(sources) - 1
-        stack = [
-            (None, node, [], (idx == last_idx)) for idx, node in enumerate(sources)
-        ][::-1]
-
-        num_skipped_children = defaultdict(lambda: 0)
-        seen_nodes = set()
-        while stack:
-            parent, node, indents, this_islast = stack.pop()
-
-            if node is not Ellipsis:
-                skip = node in seen_nodes
+    max_depth : int | None
+        The maximum depth to traverse before stopping.
+
+    prefix_table : Tuple[Tuple[str, str], ...]
+        The (this_prefix, next_prefix) glyphs for top-level / nested and last /
+        not last nodes.
+
+    backedge : str
+        The glyph indicating non-tree edges
+
+    is_directed : bool
+        If the snapshot was taken from a directed graph
+
+    Yields
+    ------
+    str : a line of generated text
+    """
+    # Populate the stack with each:
+    # 1. parent node index in the DFS tree (or None for root nodes),
+    # 2. the current node index in the DFS tree
+    # 3. a flag indicating if the node is the final one to be written.
+    # Reverse the stack so sources are popped in the correct order.
+    last_idx = len(sources) - 1
+    stack = [
+        (None, node, (idx == last_idx)) for idx, node in enumerate(sources)
+    ][::-1]
+
+    # The indentation for the current depth is shared between all frames.
+    # It grows by one entry when we descend into a node's children, and a
+    # None frame is pushed beneath those children to shrink it back once
+    # they have all been written.
+    indents = []
+
+    num_skipped_children = [0] * len(succ_list)
+    seen = bytearray(len(succ_list))
+    while stack:
+        frame = stack.pop()
+        if frame is None:
+            indents.pop()
+            continue
+        parent, node, this_islast = frame
+
+        if node is not Ellipsis:
+            skip = seen[node]
+            if parent is not None:
                 if skip:
                     # Mark that we skipped a parent's child
                     num_skipped_children[parent] += 1
 
-                if this_islast:
-                    # If we reached the last child of a parent, and we skipped
-                    # any of that parents children, then we should emit an
-                    # ellipsis at the end after this.
-                    if num_skipped_children[parent] and parent is not None:
+                # If we reached the last child of a parent, and we skipped
+                # any of that parents children, then we should emit an
+                # ellipsis at the end after this.
+                if this_islast and num_skipped_children[parent]:
 
-                        # Append the ellipsis to be emitted last
-                        next_islast = True
-                        try_frame = (node, Ellipsis, indents, next_islast)
-                        stack.append(try_frame)
+                    # Append the ellipsis to be emitted last, after this node
+                    # and its descendants
+                    next_islast = True
+                    try_frame = (node, Ellipsis, next_islast)
+                    stack.append(try_frame)
 
-                        # Redo this frame, but not as a last object
-                        next_islast = False
-                        try_frame = (parent, node, indents, next_islast)
-                        stack.append(try_frame)
-                        continue
+                    # Continue with this node, but not as a last object
+                    this_islast = False
 
-                if skip:
-                    continue
-                seen_nodes.add(node)
-
-            if not indents:
-                # Top level items (i.e. trees in the forest) get different
-                # glyphs to indicate they are not actually connected
-                if this_islast:
-                    this_prefix = indents + [glyphs.newtree_last]
-                    next_prefix = indents + [glyphs.endof_forest]
-                else:
-                    this_prefix = indents + [glyphs.newtree_mid]
-                    next_prefix = indents + [glyphs.within_forest]
+            if skip:
+                continue
+            seen[node] = 1
 
-            else:
-                # For individual tree edges distinguish between directed and
-                # undirected cases
-                if this_islast:
-                    this_prefix = indents + [glyphs.last]
-                    next_prefix = indents + [glyphs.endof_forest]
-                else:
-                    this_prefix = indents + [glyphs.mid]
-                    next_prefix = indents + [glyphs.within_tree]
+        this_prefix, next_prefix = prefix_table[
+            (bool(indents) << 1) | (not this_islast)
+        ]
 
-            if node is Ellipsis:
-                label = " ..."
-                suffix = ""
+        if node is Ellipsis:
+            label = " ..."
+            suffix = ""
+            children = []
+        else:
+            label = labels[node]
+
+            # Determine:
+            # (1) children to traverse into after showing this node.
+            # (2) parents to immediately show to the right of this node. These
+            # are the other predecessors of this node that are not handled
+            # elsewhere.
+            if max_depth is not None and len(indents) == max_depth - 1:
+                # Use ellipsis to indicate we have reached maximum depth.
+                # We only need to know if there are any children, so
+                # avoid building the list of them.
+                if is_directed:
+                    has_children = bool(succ_list[node])
+                else:
+                    has_children = any(not seen[c] for c in succ_list[node])
+                children = [Ellipsis] if has_children else []
+                other_parents = [p for p in pred_list[node] if p != parent]
+            elif is_directed:
+                # In the directed case we must show every successor node
+                # note: it may be skipped later, but we don't have that
+                # information here.
+                children = succ_list[node]
+                # In the directed case we must show every predecessor
+                # except for parent we directly traversed from.
+                other_parents = [p for p in pred_list[node] if p != parent]
+            else:
+                # Showing only the unseen children results in a more
+                # concise representation for the undirected case.
+                # Parents are also children, so we only need to immediately
+                # show the ones we can no longer traverse, i.e. the ones that
+                # have already been seen. Split the neighbors in one pass.
                 children = []
+                other_parents = []
+                for neighbor in succ_list[node]:
+                    if not seen[neighbor]:
+                        children.append(neighbor)
+                    elif neighbor != parent:
+                        other_parents.append(neighbor)
+
+            if other_parents:
+                other_parents_labels = ", ".join([labels[p] for p in other_parents])
+                suffix = " ".join(["", backedge, other_parents_labels])
             else:
-                if label_attr is not None:
-                    label = str(graph.nodes[node].get(label_attr, node))
-                else:
-                    label = str(node)
+                suffix = ""
 
-                # Determine:
-                # (1) children to traverse into after showing this node.
-                # (2) parents to immediately show to the right of this node.
-                if is_directed:
-                    # In the directed case we must show every successor node
-                    # note: it may be skipped later, but we don't have that
-                    # information here.
-                    children = list(succ[node])
-                    # In the directed case we must show every predecessor
-                    # except for parent we directly traversed from.
-                    handled_parents = {parent}
-                else:
-                    # Showing only the unseen children results in a more
-                    # concise representation for the undirected case.
-                    children = [
-                        child for child in succ[node] if child not in seen_nodes
-                    ]
-
-                    # In the undirected case, parents are also children, so we
-                    # only need to immediately show the ones we can no longer
-                    # traverse
-                    handled_parents = {*children, parent}
-
-                if max_depth is not None and len(indents) == max_depth - 1:
-                    # Use ellipsis to indicate we have reached maximum depth
-                    if children:
-                        children = [Ellipsis]
-                    handled_parents = {parent}
-
-                # The other parents are other predecessors of this node that
-                # are not handled elsewhere.
-                other_parents = [p for p in pred[node] if p not in handled_parents]
-                if other_parents:
-                    if label_attr is not None:
-                        other_parents_labels = ", ".join(
-                            [
-                                str(graph.nodes[p].get(label_attr, p))
-                                for p in other_parents
-                            ]
-                        )
-                    else:
-                        other_parents_labels = ", ".join(
-                            [str(p) for p in other_parents]
-                        )
-                    suffix = " ".join(["", glyphs.backedge, other_parents_labels])
-                else:
-                    suffix = ""
+        # Emit the line for this node, this will be called for each node
+        # exactly once.
+        yield "".join(indents) + this_prefix + label + suffix
+
+        if children:
+            # Descend one level and remember to ascend after the children
+            indents.append(next_prefix)
+            stack.append(None)
+
+            # Push children on the stack in reverse order so they are popped
+            # in the original order.
+            next_islast = True
+            for child in reversed(children):
+                try_frame = (node, child, next_islast)
+                stack.append(try_frame)
+                next_islast = False
+
+
+def _network_text_forest_lines(
+    succ_list,
+    labels,
+    sources,
+    max_depth,
+    prefix_table,
+    backedge,
+    is_directed,
+):
+    """
+    A specialization of :func:`_network_text_lines` for forests traversed from
+    one root per tree.
+
+    Each node is reached exactly once from its only parent, so there are no
+    visited nodes, skipped children, or non-tree edges to keep track of. See
+    :func:`networkx_algo_common_subtree.utils_cython._network_text_forest_lines_cython`
+    for the compiled version of this function.
 
-            # Emit the line for this node, this will be called for each node
-            # exactly once.
-            yield "".join(this_prefix + [label, suffix])
+    Parameters
+    ----------
+    succ_list : List[List[int]] | Dict[int, List[int]]
+        The successors (or neighbors for undirected graphs) of each node
+
+    labels : List[str] | Dict[int, str]
+        The text to write for each node
+
+    sources : List[int]
+        The root of each tree
+
+    max_depth : int | None
+        The maximum depth to traverse before stopping.
+
+    prefix_table : Tuple[Tuple[str, str], ...]
+        The (this_prefix, next_prefix) glyphs for top-level / nested and last /
+        not last nodes.
+
+    backedge : str
+        The glyph indicating non-tree edges
+
+    is_directed : bool
+        If the snapshot was taken from a directed graph
+
+    Yields
+    ------
+    str : a line of generated text
+    """
+    last_idx = len(sources) - 1
+    stack = [
+        (None, node, (idx == last_idx)) for idx, node in enumerate(sources)
+    ][::-1]
+    indents = []
+    while stack:
+        frame = stack.pop()
+        if frame is None:
+            indents.pop()
+            continue
+        parent, node, this_islast = frame
+
+        this_prefix, next_prefix = prefix_table[
+            (bool(indents) << 1) | (not this_islast)
+        ]
+
+        if node is Ellipsis:
+            yield "".join(indents) + this_prefix + " ..."
+            continue
 
-            # Push children on the stack in reverse order so they are popped in
-            # the original order.
-            for idx, child in enumerate(children[::-1]):
-                next_islast = idx == 0
-                try_frame = (node, child, next_prefix, next_islast)
+        if is_directed:
+            children = succ_list[node]
+        else:
+            # The only neighbor that is not a child is the parent
+            children = [child for child in succ_list[node] if child != parent]
+
+        suffix = ""
+        if max_depth is not None and len(indents) == max_depth - 1:
+            # Use ellipsis to indicate we have reached maximum depth.
+            if children:
+                if not is_directed:
+                    # In the undirected case the neighbors we can no longer
+                    # traverse are shown to the right.
+                    suffix = " ".join(
+                        ["", backedge, ", ".join([labels[c] for c in children])]
+                    )
+                children = [Ellipsis]
+
+        yield "".join(indents) + this_prefix + labels[node] + suffix
+
+        if children:
+            # Descend one level and remember to ascend after the children
+            indents.append(next_prefix)
+            stack.append(None)
+
+            # Push children on the stack in reverse order so they are popped
+            # in the original order.
+            next_islast = True
+            for child in reversed(children):
+                try_frame = (node, child, next_islast)
                 stack.append(try_frame)
+                next_islast = False
+
+
+def _cython_network_text_backend(error="ignore"):
+    """
+    Returns the cython backend for :func:`generate_network_text` if available,
+    otherwise None
+    """
+    try:
+        # Attempt to use the module build with CMake
+        from . import utils_cython
+    except Exception:
+        if error == "ignore":
+            utils_cython = None
+        elif error == "raise":
+            raise
+        else:
+            raise KeyError(error)
+    return utils_cython
 
 
 @open_file(1, "w")
@@ -554,27 +957,53 @@ def write_network_text(
         │   │   └─╼  ...
         │   └─╼  ...
         └─╼  ...
+
+    >>> # Labels are used for both nodes and non-tree edges
+    >>> graph = nx.DiGraph([(0, 1), (0, 2), (2, 1)])
+    >>> graph.nodes[0]["label"] = "root"
+    >>> graph.nodes[2]["label"] = "two"
+    >>> write_network_text(graph)
+    ╙── root
+        ├─╼ 1 ╾ two
+        └─╼ two
+            └─╼  ...
+    >>> write_network_text(graph, with_labels=False)
+    ╙── 0
+        ├─╼ 1 ╾ 2
+        └─╼ 2
+            └─╼  ...
     """
     if path is None:
         # The path is unspecified, write to stdout
         _write = sys.stdout.write
+        is_file = True
     elif hasattr(path, "write"):
         # The path is already an open file
         _write = path.write
+        is_file = True
     elif callable(path):
         # The path is a custom callable
         _write = path
+        is_file = False
     else:
         raise TypeError(type(path))
 
-    for line in generate_network_text(
+    lines = generate_network_text(
         graph,
         with_labels=with_labels,
         sources=sources,
         max_depth=max_depth,
         ascii_only=ascii_only,
-    ):
-        _write(line + end)
+    )
+    if is_file:
+        # Files get all of the text in a single write call
+        lines = list(lines)
+        if lines:
+            _write(end.join(lines) + end)
+    else:
+        # Custom callables are called once per line
+        for line in lines:
+            _write(line + end)
 
 
 def _find_sources(graph):
@@ -584,6 +1013,27 @@ def _find_sources(graph):
     # For each connected part of the graph, choose at least
     # one node as a starting point, preferably without a parent
     if graph.is_directed():
+        # Forests are the common case. If every node has at most one parent,
+        # the roots are the only candidates, and they suffice when they reach
+        # every node (i.e. there are no cycles). Check this before falling
+        # back to the more expensive SCC condensation.
+        roots = []
+        for n, d in graph.in_degree:
+            if d == 0:
+                roots.append(n)
+            elif d > 1:
+                break
+        else:
+            # Each node has at most one parent, so no node is visited twice
+            succ = graph.succ
+            stack = list(roots)
+            num_reached = 0
+            while stack:
+                num_reached += 1
+                stack.extend(succ[stack.pop()])
+            if num_reached == len(graph):
+                return roots
+
         # Choose one node from each SCC with minimum in_degree
         sccs = list(nx.strongly_connected_components(graph))
         # condensing the SCCs forms a dag, the nodes in this graph with
@@ -605,12 +1055,11 @@ def _find_sources(graph):
                 sources.append(node)
     else:
         # For undirected graph, the entire graph will be reachable as
-        # long as we consider one node from every connected component
-        sources = [
-            min(cc, key=lambda n: graph.degree[n])
-            for cc in nx.connected_components(graph)
-        ]
-        sources = sorted(sources, key=lambda n: graph.degree[n])
+        # long as we consider one node from every connected component.
+        # Snapshot the degrees once instead of querying the view per lookup.
+        degree = dict(graph.degree).__getitem__
+        sources = [min(cc, key=degree) for cc in nx.connected_components(graph)]
+        sources = sorted(sources, key=degree)
     return sources
 
 
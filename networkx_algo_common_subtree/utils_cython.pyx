@@ -0,0 +1,278 @@
+# distutils: language = c++
+#!python
+#cython: language_level=3
+
+"""
+This module re-implements the traversals behind
+:func:`networkx_algo_common_subtree.utils.generate_network_text` in cython.
+The python versions are :func:`networkx_algo_common_subtree.utils._network_text_lines`
+and :func:`networkx_algo_common_subtree.utils._network_text_forest_lines`, and
+they should be kept in sync.
+
+
+CommandLine
+-----------
+# Explicitly build this cython module
+# NOTE: cd to networkx repo root before running
+BASE_DPATH=$(python -c "import networkx_algo_common_subtree, pathlib; print(pathlib.Path(networkx_algo_common_subtree.__file__).parent)")
+cythonize -a -i $BASE_DPATH/utils_cython.pyx
+
+python -m xdoctest networkx_algo_common_subtree.utils_cython __doc__:0 --bench
+
+
+Example
+-------
+>>> from networkx_algo_common_subtree import utils
+>>> from networkx_algo_common_subtree.utils_cython import _network_text_lines_cython
+>>> import networkx as nx
+>>> graph = nx.generators.barbell_graph(4, 2)
+>>> nodes = list(graph.nodes)
+>>> succ_list = [list(graph.adj[n]) for n in nodes]
+>>> labels = [str(n) for n in nodes]
+>>> glyphs = utils.UtfUndirectedGlyphs
+>>> prefix_table = (
+>>>     (glyphs.newtree_last, glyphs.endof_forest),
+>>>     (glyphs.newtree_mid, glyphs.within_forest),
+>>>     (glyphs.last, glyphs.endof_forest),
+>>>     (glyphs.mid, glyphs.within_tree),
+>>> )
+>>> args = (succ_list, succ_list, labels, [4], None, prefix_table,
+>>>         glyphs.backedge, False)
+>>> lines1 = _network_text_lines_cython(*args)
+>>> lines2 = list(utils._network_text_lines(*args))
+>>> assert lines1 == lines2
+
+>>> from networkx_algo_common_subtree.utils_cython import _network_text_forest_lines_cython
+>>> graph = nx.balanced_tree(r=2, h=3)
+>>> nodes = list(graph.nodes)
+>>> succ_list = [list(graph.adj[n]) for n in nodes]
+>>> labels = [str(n) for n in nodes]
+>>> args = (succ_list, labels, [0], 3, prefix_table, glyphs.backedge, False)
+>>> lines1 = _network_text_forest_lines_cython(*args)
+>>> lines2 = list(utils._network_text_forest_lines(*args))
+>>> assert lines1 == lines2
+
+Benchmark
+---------
+>>> # xdoctest: +REQUIRES(--bench)
+>>> # xdoctest: +REQUIRES(module:timerit)
+>>> import timerit
+>>> import networkx as nx
+>>> from networkx_algo_common_subtree import utils
+>>> graph = utils.random_tree(10000, seed=0, create_using=nx.DiGraph)
+>>> ti = timerit.Timerit(5, bestof=2, verbose=2)
+>>> for timer in ti.reset('generate_network_text'):
+>>>     with timer:
+>>>         list(utils.generate_network_text(graph))
+"""
+cimport cython
+
+from libcpp.vector cimport vector
+
+
+# Sentinel indexes used in place of the None parent of a root node and the
+# Ellipsis node in the python implementation.
+cdef Py_ssize_t NO_PARENT = -1
+cdef Py_ssize_t ELLIPSIS = -1
+
+
+@cython.boundscheck(False)  # turn off bounds-checking for entire function
+@cython.wraparound(False)
+def _network_text_lines_cython(
+    list succ_list,
+    list pred_list,
+    labels,
+    list sources,
+    max_depth,
+    tuple prefix_table,
+    str backedge,
+    bint is_directed,
+):
+    """
+    Cython version of :func:`networkx_algo_common_subtree.utils._network_text_lines`
+
+    Returns
+    -------
+    List[str] : the lines of generated text
+    """
+    cdef Py_ssize_t num_nodes = len(succ_list)
+    cdef Py_ssize_t depth_limit = -1 if max_depth is None else max_depth - 1
+    cdef Py_ssize_t last_idx = len(sources) - 1
+    cdef Py_ssize_t idx, num_children, parent, node, child, p
+    cdef bint this_islast, skip, has_children
+    cdef str label, suffix, this_prefix, next_prefix
+    cdef list lines = []
+    cdef list indents = []
+    cdef list stack, children, neighbors, other_parents
+    cdef object frame
+    cdef vector[Py_ssize_t] num_skipped_children
+    cdef vector[char] seen
+    num_skipped_children.assign(num_nodes, 0)
+    seen.assign(num_nodes, 0)
+
+    # Reverse the stack so sources are popped in the correct order.
+    stack = []
+    for idx in range(last_idx, -1, -1):
+        stack.append((NO_PARENT, sources[idx], idx == last_idx))
+
+    while stack:
+        frame = stack.pop()
+        if frame is None:
+            indents.pop()
+            continue
+        parent, node, this_islast = frame
+
+        if node != ELLIPSIS:
+            skip = seen[node]
+            if parent != NO_PARENT:
+                if skip:
+                    # Mark that we skipped a parent's child
+                    num_skipped_children[parent] += 1
+
+                # If we reached the last child of a parent, and we skipped
+                # any of that parents children, then we should emit an
+                # ellipsis at the end after this.
+                if this_islast and num_skipped_children[parent]:
+                    stack.append((node, ELLIPSIS, True))
+                    this_islast = False
+
+            if skip:
+                continue
+            seen[node] = 1
+
+        this_prefix, next_prefix = prefix_table[
+            (len(indents) > 0) * 2 + (not this_islast)
+        ]
+
+        if node == ELLIPSIS:
+            label = " ..."
+            suffix = ""
+            children = []
+        else:
+            label = labels[node]
+            neighbors = succ_list[node]
+
+            if len(indents) == depth_limit:
+                # Use ellipsis to indicate we have reached maximum depth.
+                if is_directed:
+                    has_children = len(neighbors) > 0
+                else:
+                    has_children = False
+                    for child in neighbors:
+                        if not seen[child]:
+                            has_children = True
+                            break
+                children = [ELLIPSIS] if has_children else []
+                other_parents = [p for p in pred_list[node] if p != parent]
+            elif is_directed:
+                children = neighbors
+                other_parents = [p for p in pred_list[node] if p != parent]
+            else:
+                # Unseen neighbors are children, and seen neighbors other
+                # than the parent are shown to the right.
+                children = []
+                other_parents = []
+                for child in neighbors:
+                    if not seen[child]:
+                        children.append(child)
+                    elif child != parent:
+                        other_parents.append(child)
+
+            if other_parents:
+                suffix = " " + backedge + " " + ", ".join(
+                    [labels[p] for p in other_parents]
+                )
+            else:
+                suffix = ""
+
+        lines.append("".join(indents) + this_prefix + label + suffix)
+
+        num_children = len(children)
+        if num_children:
+            # Descend one level and remember to ascend after the children
+            indents.append(next_prefix)
+            stack.append(None)
+
+            # Push children on the stack in reverse order so they are popped
+            # in the original order.
+            for idx in range(num_children - 1, -1, -1):
+                stack.append((node, children[idx], idx == num_children - 1))
+    return lines
+
+
+@cython.boundscheck(False)  # turn off bounds-checking for entire function
+@cython.wraparound(False)
+def _network_text_forest_lines_cython(
+    list succ_list,
+    labels,
+    list sources,
+    max_depth,
+    tuple prefix_table,
+    str backedge,
+    bint is_directed,
+):
+    """
+    Cython version of :func:`networkx_algo_common_subtree.utils._network_text_forest_lines`
+
+    Returns
+    -------
+    List[str] : the lines of generated text
+    """
+    cdef Py_ssize_t depth_limit = -1 if max_depth is None else max_depth - 1
+    cdef Py_ssize_t last_idx = len(sources) - 1
+    cdef Py_ssize_t idx, num_children, parent, node, child
+    cdef bint this_islast
+    cdef str suffix, this_prefix, next_prefix
+    cdef list lines = []
+    cdef list indents = []
+    cdef list stack, children
+    cdef object frame
+
+    # Reverse the stack so sources are popped in the correct order.
+    stack = []
+    for idx in range(last_idx, -1, -1):
+        stack.append((NO_PARENT, sources[idx], idx == last_idx))
+
+    while stack:
+        frame = stack.pop()
+        if frame is None:
+            indents.pop()
+            continue
+        parent, node, this_islast = frame
+
+        this_prefix, next_prefix = prefix_table[
+            (len(indents) > 0) * 2 + (not this_islast)
+        ]
+
+        if node == ELLIPSIS:
+            lines.append("".join(indents) + this_prefix + " ...")
+            continue
+
+        if is_directed:
+            children = succ_list[node]
+        else:
+            # The only neighbor that is not a child is the parent
+            children = [child for child in succ_list[node] if child != parent]
+
+        suffix = ""
+        if len(indents) == depth_limit and children:
+            # Use ellipsis to indicate we have reached maximum depth.
+            if not is_directed:
+                suffix = " " + backedge + " " + ", ".join(
+                    [labels[child] for child in children]
+                )
+            children = [ELLIPSIS]
+
+        lines.append("".join(indents) + this_prefix + labels[node] + suffix)
+
+        num_children = len(children)
+        if num_children:
+            # Descend one level and remember to ascend after the children
+            indents.append(next_prefix)
+            stack.append(None)
+
+            # Push children on the stack in reverse order so they are popped
+            # in the original order.
+            for idx in range(num_children - 1, -1, -1):
+                stack.append((node, children[idx], idx == num_children - 1))
+    return lines
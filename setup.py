@@ -3,35 +3,60 @@
 # based on part ~/code/xcookie/xcookie/rc/setup.py.in
 import sys
 import re
-from os.path import exists, dirname, join
-from setuptools import find_packages
+from functools import lru_cache
+from os.path import abspath, exists, dirname, getmtime, join
 
-if exists("CMakeLists.txt"):
-    try:
-        import os
+# Options that only print basic metadata. These do not need the
+# requirements, the long description, or the compiled extensions.
+METADATA_ONLY_ARGS = {"--name", "--version", "--fullname"}
+
+# Splits a requirement into the package and its version specifier
+_VERSION_SPLIT_RE = re.compile(r"(>=|==|>)")
 
-        # Hack to disable all compiled extensions
-        val = os.environ.get("DISABLE_C_EXTENSIONS", "").lower()
-        use_setuptools = val in {"true", "on", "yes", "1"}
 
-    except ImportError:
+def resolve_setup(metadata_only=False):
+    """
+    Choose the setup function, only importing scikit-build when the compiled
+    extensions will actually be built.
+
+    Args:
+        metadata_only (bool): if True, the command only queries metadata and
+            plain setuptools is always used.
+
+    Returns:
+        Callable: the setup function
+    """
+    if metadata_only:
         use_setuptools = True
-else:
-    use_setuptools = True
+    elif exists("CMakeLists.txt"):
+        try:
+            import os
 
-if not use_setuptools:
-    try:
-        from skbuild import setup as skb_setup
+            # Hack to disable all compiled extensions
+            val = os.environ.get("DISABLE_C_EXTENSIONS", "").lower()
+            use_setuptools = val in {"true", "on", "yes", "1"}
 
-        setup = skb_setup  # NOQA
-    except Exception:
+        except ImportError:
+            use_setuptools = True
+    else:
         use_setuptools = True
-        import warnings
 
-        warnings.warn("scikit-build was not found, but is required to build binaries")
+    if not use_setuptools:
+        try:
+            from skbuild import setup as skb_setup
+
+            setup = skb_setup  # NOQA
+        except Exception:
+            use_setuptools = True
+            import warnings
 
-if use_setuptools:
-    from setuptools import setup
+            warnings.warn(
+                "scikit-build was not found, but is required to build binaries"
+            )
+
+    if use_setuptools:
+        from setuptools import setup
+    return setup
 
 
 def parse_version(fpath):
@@ -46,12 +71,34 @@ def static_parse(varname, fpath):
     """
     Statically parse the a constant variable from a python file
     """
-    import ast
-
     if not exists(fpath):
         raise ValueError("fpath={!r} does not exist".format(fpath))
+    # The modification time is part of the cache key so edits are noticed
+    return _static_parse(varname, fpath, getmtime(fpath))
+
+
+@lru_cache(maxsize=None)
+def _static_parse(varname, fpath, mtime):
+    """
+    Cached implementation of :func:`static_parse`
+    """
     with open(fpath, "r") as file_:
         sourcecode = file_.read()
+
+    # Fast path: if the variable is only mentioned once, in a plain string
+    # assignment (at any indentation) that is not inside a triple quoted
+    # string, then that is the value the ast visitor below would find.
+    pattern = r"""^[ \t]*{}[ \t]*=[ \t]*(['"])([^'"\n]*)\1[ \t]*$""".format(
+        re.escape(varname)
+    )
+    match = re.search(pattern, sourcecode, flags=re.MULTILINE)
+    if match is not None and sourcecode.count(varname) == 1:
+        before = sourcecode[: match.start()]
+        if before.count('"""') % 2 == 0 and before.count("'''") % 2 == 0:
+            return match.group(2)
+
+    import ast
+
     pt = ast.parse(sourcecode)
 
     class StaticVisitor(ast.NodeVisitor):
@@ -89,6 +136,76 @@ def parse_description():
     return ""
 
 
+def _parse_requirement_line(line, dpath=""):
+    """
+    Parse information from a line in a requirements text file
+
+    line = 'git+https://a.com/somedep@sometag#egg=SomeDep'
+    line = '-e git+https://a.com/somedep@sometag#egg=SomeDep'
+    """
+    # Remove inline comments
+    line = line.partition(" #")[0]
+
+    if line.startswith("-r "):
+        # Allow specifying requirements in other files
+        target = join(dpath, line.split(" ")[1])
+        for info in _parse_require_file(target):
+            yield info
+    else:
+        # See: https://www.python.org/dev/peps/pep-0508/
+        info = {"line": line}
+        if line.startswith("-e "):
+            info["package"] = line.split("#egg=")[1]
+        else:
+            if "--find-links" in line:
+                # setuptools doesnt seem to handle find links
+                line = line.split("--find-links")[0]
+            if ";" in line:
+                pkgpart, platpart = line.split(";")
+                # Handle platform specific dependencies
+                # setuptools.readthedocs.io/en/latest/setuptools.html
+                # #declaring-platform-specific-dependencies
+                plat_deps = platpart.strip()
+                info["platform_deps"] = plat_deps
+            else:
+                pkgpart = line
+                platpart = None
+
+            # Remove versioning from the package
+            parts = _VERSION_SPLIT_RE.split(pkgpart, maxsplit=1)
+            parts = [p.strip() for p in parts]
+
+            info["package"] = parts[0]
+            if len(parts) > 1:
+                op, rest = parts[1:]
+                version = rest  # NOQA
+                info["version"] = (op, version)
+        yield info
+
+
+@lru_cache(maxsize=None)
+def _parse_require_file(fpath):
+    """
+    Parse information from each line in a requirements text file.
+
+    The result is cached, so each file (including those it references with
+    ``-r``) is only read and parsed once, no matter how many times it is
+    requested by :func:`parse_requirements`.
+
+    Returns:
+        Tuple[Dict]: parsed information for each requirement. These are
+            shared between calls and must not be modified.
+    """
+    dpath = dirname(fpath)
+    infos = []
+    with open(fpath, "r") as f:
+        for line in f.readlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                infos.extend(_parse_requirement_line(line, dpath=dpath))
+    return tuple(infos)
+
+
 def parse_requirements(fname="requirements.txt", versions=False):
     """
     Parse the package dependencies listed in a requirements file but strips
@@ -108,67 +225,9 @@ def parse_requirements(fname="requirements.txt", versions=False):
     """
     require_fpath = fname
 
-    def parse_line(line, dpath=""):
-        """
-        Parse information from a line in a requirements text file
-
-        line = 'git+https://a.com/somedep@sometag#egg=SomeDep'
-        line = '-e git+https://a.com/somedep@sometag#egg=SomeDep'
-        """
-        # Remove inline comments
-        comment_pos = line.find(" #")
-        if comment_pos > -1:
-            line = line[:comment_pos]
-
-        if line.startswith("-r "):
-            # Allow specifying requirements in other files
-            target = join(dpath, line.split(" ")[1])
-            for info in parse_require_file(target):
-                yield info
-        else:
-            # See: https://www.python.org/dev/peps/pep-0508/
-            info = {"line": line}
-            if line.startswith("-e "):
-                info["package"] = line.split("#egg=")[1]
-            else:
-                if "--find-links" in line:
-                    # setuptools doesnt seem to handle find links
-                    line = line.split("--find-links")[0]
-                if ";" in line:
-                    pkgpart, platpart = line.split(";")
-                    # Handle platform specific dependencies
-                    # setuptools.readthedocs.io/en/latest/setuptools.html
-                    # #declaring-platform-specific-dependencies
-                    plat_deps = platpart.strip()
-                    info["platform_deps"] = plat_deps
-                else:
-                    pkgpart = line
-                    platpart = None
-
-                # Remove versioning from the package
-                pat = "(" + "|".join([">=", "==", ">"]) + ")"
-                parts = re.split(pat, pkgpart, maxsplit=1)
-                parts = [p.strip() for p in parts]
-
-                info["package"] = parts[0]
-                if len(parts) > 1:
-                    op, rest = parts[1:]
-                    version = rest  # NOQA
-                    info["version"] = (op, version)
-            yield info
-
-    def parse_require_file(fpath):
-        dpath = dirname(fpath)
-        with open(fpath, "r") as f:
-            for line in f.readlines():
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    for info in parse_line(line, dpath=dpath):
-                        yield info
-
     def gen_packages_items():
         if exists(require_fpath):
-            for info in parse_require_file(require_fpath):
+            for info in _parse_require_file(abspath(require_fpath)):
                 parts = [info["package"]]
                 if versions and "version" in info:
                     if versions == "strict":
@@ -225,7 +284,16 @@ NAME = "networkx_algo_common_subtree"
 INIT_PATH = "networkx_algo_common_subtree/__init__.py"
 VERSION = parse_version(INIT_PATH)
 
-if __name__ == "__main__":
+
+def build_setupkw():
+    """
+    Assemble the full keyword arguments for the setup function.
+
+    Returns:
+        Dict: keyword arguments for setup
+    """
+    from setuptools import find_packages
+
     setupkw = {}
 
     setupkw["install_requires"] = parse_requirements(
@@ -275,4 +343,14 @@ if __name__ == "__main__":
         "Programming Language :: Python :: 3.11",
         "Programming Language :: Python :: 3.12",
     ]
+    return setupkw
+
+
+if __name__ == "__main__":
+    metadata_only = bool(sys.argv[1:]) and set(sys.argv[1:]) <= METADATA_ONLY_ARGS
+    setup = resolve_setup(metadata_only=metadata_only)
+    if metadata_only:
+        setupkw = {"name": NAME, "version": VERSION}
+    else:
+        setupkw = build_setupkw()
     setup(**setupkw)
@@ -1,3 +1,6 @@
+import functools
+import weakref
+
 import networkx as nx
 import pytest
 from networkx.utils import create_py_random_state
@@ -9,6 +12,15 @@ from networkx_algo_common_subtree._types import OrderedDiGraph
 from networkx_algo_common_subtree.tree_embedding import tree_to_seq
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_random_tree(n, seed):
+    """
+    Memoized :func:`random_tree` for integer seeds. The returned tree is shared
+    between callers and must not be modified.
+    """
+    return random_tree(n, seed=seed, create_using=OrderedDiGraph)
+
+
 def test_null_common_embedding():
     """
     The empty graph is not a tree and should raise an error
@@ -65,40 +77,59 @@ def test_common_tree_embedding_small2():
     print(graph_str(embedding2))
 
 
-def test_all_implementations_are_same():
-    """
-    Tests several random sequences
-    """
+_TRIAL_SEED = 24658885408229410362279507020239
+_NUM_TRIALS = 5
+_IMPLS = balanced_embedding.available_impls_longest_common_balanced_embedding()
 
-    seed = 24658885408229410362279507020239
-    rng = create_py_random_state(seed)
 
+def _trial_trees(trial_idx):
+    """
+    Deterministically generates the pair of random trees used in a trial
+    """
+    rng = create_py_random_state(_TRIAL_SEED + trial_idx)
     maxsize = 20
-    num_trials = 5
+    n1 = rng.randint(1, maxsize)
+    n2 = rng.randint(1, maxsize)
+    tree1 = _cached_random_tree(n1, seed=rng.randint(0, 2 ** 31))
+    tree2 = _cached_random_tree(n2, seed=rng.randint(0, 2 ** 31))
+    return tree1, tree2
 
+
+@functools.lru_cache(maxsize=None)
+def _trial_embedding_value(trial_idx, impl):
+    """
+    Computes and validates the common embedding of a trial with one
+    implementation and returns its value.
+    """
+    tree1, tree2 = _trial_trees(trial_idx)
     node_affinity = "eq"
+    # FIXME: do we need to rework the return value here?
+    embedding1, embedding2, value = maximum_common_ordered_subtree_embedding(
+        tree1, tree2, node_affinity=node_affinity, impl=impl
+    )
+    _check_common_embedding_invariants(tree1, tree2, embedding1, embedding2)
+    return value
 
-    for _ in range(num_trials):
-        n1 = rng.randint(1, maxsize)
-        n2 = rng.randint(1, maxsize)
 
-        tree1 = random_tree(n1, seed=rng, create_using=OrderedDiGraph)
-        tree2 = random_tree(n2, seed=rng, create_using=OrderedDiGraph)
+@pytest.mark.parametrize("impl", _IMPLS)
+@pytest.mark.parametrize("trial_idx", range(_NUM_TRIALS))
+def test_implementation_on_random_trees(trial_idx, impl):
+    """
+    Tests each implementation on several random sequences
+    """
+    _trial_embedding_value(trial_idx, impl)
 
-        # Note: the returned sequences may be different (maximum embeddings may
-        # not be unique), but the values should all be the same.
-        results = {}
-        impls = balanced_embedding.available_impls_longest_common_balanced_embedding()
-        for impl in impls:
-            # FIXME: do we need to rework the return value here?
-            embedding1, embedding2, value = maximum_common_ordered_subtree_embedding(
-                tree1, tree2, node_affinity=node_affinity, impl=impl
-            )
-            _check_common_embedding_invariants(tree1, tree2, embedding1, embedding2)
-            results[impl] = value
 
-        x = max(results.values())
-        assert all(v == x for v in results.values())
+@pytest.mark.parametrize("trial_idx", range(_NUM_TRIALS))
+def test_all_implementations_are_same(trial_idx):
+    """
+    Tests several random sequences
+    """
+    # Note: the returned sequences may be different (maximum embeddings may
+    # not be unique), but the values should all be the same.
+    results = {impl: _trial_embedding_value(trial_idx, impl) for impl in _IMPLS}
+    x = max(results.values())
+    assert all(v == x for v in results.values())
 
 
 def _check_embedding_invariants(tree, subtree):
@@ -121,29 +152,8 @@ def _check_contractions(tree1, tree2, embedding1, embedding2):
     """
     Only valid if ``node_affinity`` was "auto"
     """
-    # We reverse topologically sort so we always contract from leaves to the
-    # root
-    remove_nodes1 = [
-        n for n in nx.topological_sort(tree1) if n not in embedding1.nodes
-    ][::-1]
-    remove_nodes2 = [
-        n for n in nx.topological_sort(tree2) if n not in embedding2.nodes
-    ][::-1]
-
-    contract_edges1 = [(u, v) for v in remove_nodes1 for u in tree1.pred[v]]
-    contract_edges2 = [(u, v) for v in remove_nodes2 for u in tree2.pred[v]]
-
-    embedding1_alt = tree1.copy()
-    for u, v in contract_edges1:
-        nx.contracted_nodes(embedding1_alt, u, v, copy=False, self_loops=False)
-    # Handle the case where sources nodes are removed
-    embedding1_alt.remove_nodes_from(remove_nodes1)
-
-    embedding2_alt = tree2.copy()
-    for u, v in contract_edges2:
-        nx.contracted_nodes(embedding2_alt, u, v, copy=False, self_loops=False)
-    # Handle the case where sources nodes are removed
-    embedding2_alt.remove_nodes_from(remove_nodes2)
+    embedding1_alt = _contract_removed_nodes(tree1, embedding1.nodes)
+    embedding2_alt = _contract_removed_nodes(tree2, embedding2.nodes)
 
     assert set(embedding1.nodes) == set(embedding1_alt.nodes)
     assert set(embedding1.edges) == set(embedding1_alt.edges)
@@ -160,26 +170,69 @@ def _check_contractions(tree1, tree2, embedding1, embedding2):
         graph_str(embedding2_alt, write=print)
 
 
+def _contract_removed_nodes(tree, keep_nodes):
+    """
+    Contracts every node not in ``keep_nodes`` into its parent, which connects
+    each kept node to its nearest kept ancestor.
+    """
+    # Visit parents before children so the surviving ancestor of a removed
+    # node's parent is known. Removed sources have no surviving ancestor.
+    survivor = {}
+    for n in _topological_order(tree):
+        if n in keep_nodes:
+            survivor[n] = n
+        else:
+            parent = next(iter(tree.pred[n]), None)
+            survivor[n] = None if parent is None else survivor[parent]
+
+    contracted = type(tree)()
+    contracted.add_nodes_from(n for n in tree.nodes if n in keep_nodes)
+    contracted.add_edges_from(
+        (survivor[u], v)
+        for u, v in tree.edges
+        if v in keep_nodes and survivor[u] is not None
+    )
+    return contracted
+
+
+_TOPO_CACHE = weakref.WeakKeyDictionary()
+
+
+def _topological_order(tree):
+    """
+    Memoized topological order of a tree, which must not be modified after
+    the first call.
+    """
+    order = _TOPO_CACHE.get(tree)
+    if order is None:
+        order = _TOPO_CACHE[tree] = list(nx.topological_sort(tree))
+    return order
+
+
 def test_forest_case():
     # Test forest case
     F = nx.disjoint_union_all(
         [
-            random_tree(3, seed=0, create_using=OrderedDiGraph),
-            random_tree(5, seed=1, create_using=OrderedDiGraph),
-            random_tree(5, seed=1, create_using=OrderedDiGraph),
-            random_tree(2, seed=2, create_using=OrderedDiGraph),
-            random_tree(1, seed=3, create_using=OrderedDiGraph),
+            _cached_random_tree(3, seed=0),
+            _cached_random_tree(5, seed=1),
+            _cached_random_tree(5, seed=1),
+            _cached_random_tree(2, seed=2),
+            _cached_random_tree(1, seed=3),
         ]
     )
 
-    # Just verify everything runs without error for now. Would be best to find
-    # something to check though.
     print(graph_str(F))
-    sequence, *_ = tree_to_seq(F, item_type="number")
-    print("sequence = {!r}".format(sequence))
-    sequence, *_ = tree_to_seq(F, item_type="chr")
-    print("sequence = {!r}".format(sequence))
-    sequence, *_ = tree_to_seq(F, item_type="chr", container_type="str")
-    print("sequence = {!r}".format(sequence))
-    sequence, *_ = tree_to_seq(F, item_type="chr", container_type="tuple")
-    print("sequence = {!r}".format(sequence))
+    # Traverse the forest once per item type and build each container from the
+    # resulting list.
+    number_items, *_ = tree_to_seq(F, item_type="number", container_type="list")
+    print("sequence = {!r}".format(tuple(number_items)))
+    chr_items, *_ = tree_to_seq(F, item_type="chr", container_type="list")
+    print("sequence = {!r}".format("".join(chr_items)))
+    print("sequence = {!r}".format(tuple(chr_items)))
+
+    # Both encodings come from the same traversal. The k-th opening token is k
+    # or chr(2 * (k - 1)) and its closing token is -k or chr(2 * (k - 1) + 1).
+    expected = [
+        chr(2 * (k - 1)) if k > 0 else chr(2 * (-k - 1) + 1) for k in number_items
+    ]
+    assert chr_items == expected